@@ -1,21 +1,95 @@
-CREATE DATABASE "rag-docs";
-\c rag-docs
-
-CREATE EXTENSION IF NOT EXISTS vector WITH SCHEMA public;
-
-CREATE SEQUENCE IF NOT EXISTS public.data_llamaindex_id_seq
-    START WITH 1
-    INCREMENT BY 1
-    NO MINVALUE
-    NO MAXVALUE
-    CACHE 1;
-
-CREATE TABLE IF NOT EXISTS public.data_llamaindex (
-    id bigint NOT NULL DEFAULT nextval('public.data_llamaindex_id_seq'::regclass),
-    text character varying NOT NULL,
-    metadata_ json,
-    node_id character varying,
-    embedding public.vector(384)
-);
-
-CREATE UNIQUE INDEX IF NOT EXISTS data_llamaindex_pkey ON public.data_llamaindex USING btree (id);
\ No newline at end of file
+CREATE DATABASE "rag-docs";
+\c rag-docs
+
+CREATE EXTENSION IF NOT EXISTS vector WITH SCHEMA public;
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm WITH SCHEMA public;
+
+CREATE SEQUENCE IF NOT EXISTS public.data_llamaindex_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+CREATE TABLE IF NOT EXISTS public.data_llamaindex (
+    id bigint NOT NULL DEFAULT nextval('public.data_llamaindex_id_seq'::regclass),
+    text character varying NOT NULL,
+    metadata_ json,
+    node_id character varying,
+    embedding public.vector(384),
+    filepath character varying GENERATED ALWAYS AS (metadata_->>'filepath') STORED,
+    filename character varying GENERATED ALWAYS AS (metadata_->>'filename') STORED,
+    chunk_hash character varying GENERATED ALWAYS AS (metadata_->>'chunk_hash') STORED,
+    text_search tsvector GENERATED ALWAYS AS (to_tsvector('english', text)) STORED,
+    file_type character varying GENERATED ALWAYS AS (lower(substring(metadata_->>'filename' FROM '[.]([^./]+)$'))) STORED,
+    ingested_at timestamptz NOT NULL DEFAULT now()
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS data_llamaindex_pkey ON public.data_llamaindex USING btree (id);
+
+CREATE INDEX IF NOT EXISTS data_llamaindex_embedding_idx ON public.data_llamaindex USING hnsw (embedding vector_cosine_ops) WITH (m = 16, ef_construction = 64);
+
+CREATE INDEX IF NOT EXISTS data_llamaindex_filepath_idx ON public.data_llamaindex USING btree (filepath);
+
+CREATE INDEX IF NOT EXISTS data_llamaindex_filepath_prefix_idx ON public.data_llamaindex USING btree (filepath varchar_pattern_ops);
+
+CREATE INDEX IF NOT EXISTS data_llamaindex_filename_idx ON public.data_llamaindex USING btree (filename);
+
+CREATE INDEX IF NOT EXISTS data_llamaindex_file_type_idx ON public.data_llamaindex USING btree (file_type);
+
+CREATE INDEX IF NOT EXISTS data_llamaindex_ingested_at_idx ON public.data_llamaindex USING btree (ingested_at);
+
+CREATE INDEX IF NOT EXISTS data_llamaindex_chunk_hash_idx ON public.data_llamaindex USING btree (chunk_hash);
+
+CREATE INDEX IF NOT EXISTS data_llamaindex_text_search_idx ON public.data_llamaindex USING gin (text_search);
+
+CREATE TABLE IF NOT EXISTS public.documents (
+    id bigserial PRIMARY KEY,
+    filepath character varying NOT NULL UNIQUE,
+    filename character varying NOT NULL,
+    content_hash character varying,
+    chunk_count integer NOT NULL DEFAULT 0,
+    ingested_at timestamptz NOT NULL DEFAULT now(),
+    file_type character varying GENERATED ALWAYS AS (lower(substring(filename FROM '[.]([^./]+)$'))) STORED
+);
+
+CREATE INDEX IF NOT EXISTS documents_filename_idx ON public.documents USING btree (filename);
+
+CREATE INDEX IF NOT EXISTS documents_file_type_idx ON public.documents USING btree (file_type);
+
+CREATE INDEX IF NOT EXISTS documents_ingested_at_idx ON public.documents USING btree (ingested_at);
+
+CREATE INDEX IF NOT EXISTS documents_chunk_count_idx ON public.documents USING btree (chunk_count, id);
+
+CREATE INDEX IF NOT EXISTS documents_search_idx ON public.documents USING gin (lower(filename || ' ' || filepath) gin_trgm_ops);
+
+CREATE TABLE IF NOT EXISTS public.corpus_version (
+    id integer PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+    version bigint NOT NULL DEFAULT 0,
+    updated_at timestamptz NOT NULL DEFAULT now()
+);
+
+INSERT INTO public.corpus_version (id) VALUES (1) ON CONFLICT (id) DO NOTHING;
+
+CREATE TABLE IF NOT EXISTS public.ingest_jobs (
+    id bigserial PRIMARY KEY,
+    bucket character varying NOT NULL,
+    object_key character varying NOT NULL,
+    action character varying NOT NULL DEFAULT 'index',
+    event_name character varying,
+    etag character varying,
+    state character varying NOT NULL DEFAULT 'queued',
+    attempts integer NOT NULL DEFAULT 0,
+    chunks integer,
+    reason character varying,
+    error text,
+    created_at timestamptz NOT NULL DEFAULT now(),
+    started_at timestamptz,
+    heartbeat_at timestamptz,
+    finished_at timestamptz
+);
+
+CREATE INDEX IF NOT EXISTS ingest_jobs_state_idx ON public.ingest_jobs USING btree (state, id);
+
+CREATE INDEX IF NOT EXISTS ingest_jobs_object_idx ON public.ingest_jobs USING btree (bucket, object_key, state);
\ No newline at end of file
@@ -0,0 +1,108 @@
+"""Compare embedding throughput and retrieval recall across runtime backends.
+
+Chunks the example documents the way the embedder does, embeds them with each
+backend and reports chunks/second, query latency and, against the ``torch``
+baseline, the mean cosine similarity of the embeddings and the recall@k of
+nearest-neighbour search using every chunk's first sentence as a query.
+
+Usage (from the repository root, with the embedder requirements installed):
+
+    python scripts/benchmark_embeddings.py --backends torch onnx onnx-int8
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src", "embedder"))
+
+from embeddings import EMBED_BACKENDS, load_embed_model, warm_up  # noqa: E402
+from llama_index.core.node_parser import TokenTextSplitter  # noqa: E402
+
+
+def load_chunks(docs_dir):
+    splitter = TokenTextSplitter(chunk_size=800, chunk_overlap=50)
+    chunks = []
+    for name in sorted(os.listdir(docs_dir)):
+        if name.endswith(".txt"):
+            with open(os.path.join(docs_dir, name), encoding="utf-8") as f:
+                chunks.extend(splitter.split_text(f.read()))
+    return chunks
+
+
+def make_queries(chunks):
+    return [chunk.split(".")[0][:200] for chunk in chunks]
+
+
+def top_k(query_embeddings, chunk_embeddings, k):
+    scores = query_embeddings @ chunk_embeddings.T
+    return np.argsort(-scores, axis=1)[:, :k]
+
+
+def normalize(embeddings):
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    return embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+
+
+def run(backend, chunks, queries, args):
+    model = load_embed_model(
+        "all-MiniLM-L6-v2", backend=backend, threads=args.threads, max_batch_size=args.batch_size
+    )
+    warm_up(model)
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        chunk_embeddings = model.get_text_embedding_batch(chunks)
+    throughput = len(chunks) * args.repeat / (time.perf_counter() - start)
+
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        model.get_query_embedding(query)
+        latencies.append(time.perf_counter() - start)
+
+    query_embeddings = model.get_text_embedding_batch(queries)
+    return normalize(chunk_embeddings), normalize(query_embeddings), throughput, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--backends", nargs="+", default=list(EMBED_BACKENDS), choices=EMBED_BACKENDS)
+    parser.add_argument("--docs", default=os.path.join("data", "example", "docs"))
+    parser.add_argument("--threads", type=int, default=0)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("-k", type=int, default=5)
+    args = parser.parse_args()
+
+    chunks = load_chunks(args.docs)
+    queries = make_queries(chunks)
+    print(f"{len(chunks)} chunks, {len(queries)} queries from {args.docs}")
+
+    backends = ["torch"] + [backend for backend in args.backends if backend != "torch"]
+    baseline = None
+    print(f"{'backend':<10} {'chunks/s':>10} {'query p50 ms':>13} {'query p95 ms':>13} {'cosine':>8} {'recall@' + str(args.k):>9}")
+    for backend in backends:
+        chunk_embeddings, query_embeddings, throughput, latencies = run(backend, chunks, queries, args)
+        neighbours = top_k(query_embeddings, chunk_embeddings, args.k)
+        if baseline is None:
+            baseline = chunk_embeddings, neighbours
+        cosine = float(np.mean(np.sum(chunk_embeddings * baseline[0], axis=1)))
+        recall = np.mean([
+            len(set(found) & set(expected)) / args.k
+            for found, expected in zip(neighbours, baseline[1])
+        ])
+        latencies_ms = sorted(latency * 1000 for latency in latencies)
+        p95 = latencies_ms[int(0.95 * (len(latencies_ms) - 1))]
+        print(
+            f"{backend:<10} {throughput:>10.1f} {statistics.median(latencies_ms):>13.2f} "
+            f"{p95:>13.2f} {cosine:>8.4f} {recall:>9.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Bring the database schema up to date before rolling out a new embedder.
+
+Adds the columns, tables and indexes that the current ``config/init_db.sql``
+creates but databases initialized by older releases lack. Adding the stored
+generated columns rewrites ``data_llamaindex`` under an exclusive lock, so on a
+large corpus run this once during a maintenance window and deploy with
+``SCHEMA_AUTO_MIGRATE=false``. Indexes are built concurrently.
+
+Usage (from the repository root, with the embedder requirements installed and
+the embedder's ``POSTGRES_*`` variables set):
+
+    python scripts/migrate_schema.py [--check]
+"""
+import argparse
+import logging
+import os
+import sys
+
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src", "embedder"))
+
+from db import engine  # noqa: E402
+from jobs import JobQueue  # noqa: E402
+from schema import check_schema, migrate_schema  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--check", action="store_true", help="only list what is missing, exit 1 if anything is")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    missing = check_schema(engine)
+    for item in missing:
+        print(f"missing {item}")
+    if args.check:
+        sys.exit(1 if missing else 0)
+    if not missing:
+        print("Schema is up to date")
+        return
+
+    JobQueue(engine).ensure_schema()
+    migrate_schema(engine)
+    print("Schema migrated")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+import logging
+import threading
+import time
+from concurrent.futures import Future
+
+from llama_index.core.schema import MetadataMode
+
+from metrics import CHUNKS_CREATED, EMBEDDING_DURATION, INGEST_STAGE_DURATION, batch_size_label
+
+
+class _Ticket:
+    """Tracks how many nodes of a single submission are still waiting to be written.
+
+    Batches of one ticket can be written by several threads (job workers and the
+    timer), so the accounting and resolving the future happen under a lock.
+    """
+
+    def __init__(self, future, remaining):
+        self.future = future
+        self.remaining = remaining
+        self.written = 0
+        self._lock = threading.Lock()
+
+    def done(self, count):
+        with self._lock:
+            self.remaining -= count
+            self.written += count
+            if self.remaining <= 0 and not self.future.done():
+                self.future.set_result(self.written)
+
+    def fail(self, error):
+        with self._lock:
+            if not self.future.done():
+                self.future.set_exception(error)
+
+
+def gather(futures):
+    """Return a future resolving to the sum of ``futures`` once all are done.
+
+    The first failure fails the combined future.
+    """
+    combined = Future()
+    remaining = [len(futures)]
+    total = [0]
+    lock = threading.Lock()
+
+    if not futures:
+        combined.set_result(0)
+        return combined
+
+    def on_done(future):
+        error = future.exception()
+        with lock:
+            if combined.done():
+                return
+            if error is not None:
+                combined.set_exception(error)
+                return
+            total[0] += future.result()
+            remaining[0] -= 1
+            if remaining[0] == 0:
+                combined.set_result(total[0])
+
+    for future in futures:
+        future.add_done_callback(on_done)
+    return combined
+
+
+class IngestBatcher:
+    """Collect nodes from many files and embed/insert them in fixed-size batches.
+
+    A batch is written as soon as ``batch_size`` nodes are pending, or once the
+    oldest pending node has waited ``max_wait`` seconds. Every call to ``add``
+    returns a future that resolves to the number of nodes written once all of
+    the submitted nodes are stored. Nodes that already carry an embedding are
+    stored without being embedded again.
+    """
+
+    def __init__(self, embed_model, store, batch_size=128, max_wait=2.0):
+        self.embed_model = embed_model
+        self.store = store
+        self.batch_size = max(1, batch_size)
+        self.max_wait = max_wait
+        self._pending = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._write_lock = threading.Lock()
+        self._timer = threading.Thread(target=self._run_timer, daemon=True)
+        self._timer.start()
+
+    def add(self, nodes):
+        """Queue nodes for embedding and return a future for their completion."""
+        future = Future()
+        if not nodes:
+            future.set_result(0)
+            return future
+
+        ticket = _Ticket(future, len(nodes))
+        added_at = time.monotonic()
+        with self._lock:
+            self._pending.extend((node, ticket, added_at) for node in nodes)
+            full = len(self._pending) >= self.batch_size
+            self._wakeup.notify()
+
+        if full:
+            self.flush(full_only=True)
+        return future
+
+    def flush(self, full_only=False):
+        """Write pending nodes. With ``full_only`` a trailing partial batch is kept."""
+        while True:
+            with self._lock:
+                if not self._pending:
+                    return
+                if full_only and len(self._pending) < self.batch_size:
+                    return
+                batch = self._pending[:self.batch_size]
+                del self._pending[:self.batch_size]
+            self._write(batch)
+
+    def _write(self, batch):
+        nodes = [node for node, _, _ in batch]
+        with self._write_lock:
+            try:
+                missing = [node for node in nodes if node.embedding is None]
+                if missing:
+                    start = time.perf_counter()
+                    texts = [node.get_content(metadata_mode=MetadataMode.EMBED) for node in missing]
+                    embeddings = self.embed_model.get_text_embedding_batch(texts)
+                    for node, embedding in zip(missing, embeddings):
+                        node.embedding = embedding
+                    duration = time.perf_counter() - start
+                    EMBEDDING_DURATION.labels(batch_size_label(len(missing))).observe(duration)
+                    INGEST_STAGE_DURATION.labels("embedding").observe(duration)
+                with INGEST_STAGE_DURATION.labels("db_insert").time():
+                    self.store.add(nodes)
+                CHUNKS_CREATED.inc(len(nodes))
+                logging.info(f"Embedded and stored batch of {len(nodes)} chunks")
+            except Exception as e:
+                logging.error(f"Error writing batch of {len(nodes)} chunks: {str(e)}")
+                for ticket in {id(t): t for _, t, _ in batch}.values():
+                    ticket.fail(e)
+                return
+
+        counts = {}
+        for _, ticket, _ in batch:
+            counts.setdefault(id(ticket), [ticket, 0])[1] += 1
+        for ticket, count in counts.values():
+            ticket.done(count)
+
+    def _run_timer(self):
+        while True:
+            with self._lock:
+                while not self._pending:
+                    self._wakeup.wait()
+                delay = self._pending[0][2] + self.max_wait - time.monotonic()
+                if delay > 0:
+                    self._wakeup.wait(delay)
+                    continue
+            self.flush()
@@ -0,0 +1,109 @@
+import logging
+import threading
+import time
+
+from sqlalchemy import text
+
+from db import bump_corpus_version
+
+
+MINIO_PREFIX = "minio://"
+
+
+def delete_documents(engine, filepaths):
+    """Delete the chunks and documents rows of ``filepaths`` in one transaction.
+
+    Returns ``(documents_deleted, chunks_deleted)``. Both deletes go through the
+    ``filepath`` indexes, whatever the number of paths.
+    """
+    if not filepaths:
+        return 0, 0
+    params = {"filepaths": list(filepaths)}
+    with engine.begin() as connection:
+        chunks_deleted = connection.execute(
+            text("DELETE FROM data_llamaindex WHERE filepath = ANY(:filepaths)"), params
+        ).rowcount
+        documents_deleted = connection.execute(
+            text("DELETE FROM documents WHERE filepath = ANY(:filepaths)"), params
+        ).rowcount
+        if chunks_deleted or documents_deleted:
+            bump_corpus_version(connection)
+    return documents_deleted, chunks_deleted
+
+
+def indexed_filepaths(engine):
+    """Filepaths that have a documents row or chunks stored."""
+    with engine.connect() as connection:
+        rows = connection.execute(text("""
+            SELECT filepath FROM documents
+            UNION
+            SELECT DISTINCT filepath FROM data_llamaindex WHERE filepath IS NOT NULL
+        """))
+        return [filepath for filepath, in rows]
+
+
+def stale_filepaths(engine, minio_client):
+    """Indexed ``minio://`` filepaths whose object no longer exists in its bucket.
+
+    Buckets that can't be listed are skipped, so a MinIO outage never deletes
+    anything.
+    """
+    by_bucket = {}
+    for filepath in indexed_filepaths(engine):
+        if not filepath.startswith(MINIO_PREFIX):
+            continue
+        bucket, _, key = filepath[len(MINIO_PREFIX):].partition("/")
+        by_bucket.setdefault(bucket, {})[key] = filepath
+
+    stale = []
+    for bucket, paths in by_bucket.items():
+        try:
+            keys = {obj.object_name for obj in minio_client.list_objects(bucket, recursive=True)}
+        except Exception as e:
+            logging.error(f"Error listing bucket {bucket}, skipping it: {str(e)}")
+            continue
+        stale.extend(filepath for key, filepath in paths.items() if key not in keys)
+    return stale
+
+
+def collect_garbage(engine, minio_client):
+    """Remove the chunks of objects that were deleted from MinIO and report counts."""
+    start = time.perf_counter()
+    stale = stale_filepaths(engine, minio_client)
+    documents_deleted, chunks_deleted = delete_documents(engine, stale)
+    duration = time.perf_counter() - start
+    if stale:
+        logging.info(
+            f"Garbage collection removed {chunks_deleted} chunks and {documents_deleted} documents "
+            f"of {len(stale)} deleted objects in {duration:.1f}s"
+        )
+    return {
+        "stale_files": len(stale),
+        "documents_deleted": documents_deleted,
+        "chunks_deleted": chunks_deleted,
+        "duration_seconds": round(duration, 3),
+    }
+
+
+class GarbageCollector:
+    """Background thread running ``collect_garbage`` every ``interval`` seconds."""
+
+    def __init__(self, engine, minio_client, interval=3600):
+        self.engine = engine
+        self.minio_client = minio_client
+        self.interval = interval
+        self._thread = None
+
+    def start(self):
+        if self.interval <= 0:
+            return
+        self._thread = threading.Thread(target=self._run, name="garbage-collector", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                collect_garbage(self.engine, self.minio_client)
+            except Exception as e:
+                logging.error(f"Error collecting garbage: {str(e)}")
@@ -0,0 +1,77 @@
+import logging
+import os
+import time
+
+
+EMBED_BACKENDS = ("torch", "onnx", "onnx-int8")
+
+# Dynamically quantized export shipped in the sentence-transformers model repos.
+DEFAULT_ONNX_INT8_FILE = "onnx/model_quint8_avx2.onnx"
+
+
+def load_embed_model(model_name, backend="torch", threads=0, max_batch_size=32,
+                     onnx_file=None, cache_folder=None):
+    """Load ``model_name`` with the given runtime backend.
+
+    ``torch`` runs the model eagerly in PyTorch, ``onnx`` runs its ONNX export
+    with ONNX Runtime and ``onnx-int8`` runs the int8-quantized export.
+    ``threads`` > 0 caps the intra-op threads of the runtime, ``onnx_file``
+    overrides the ONNX file to load from the model repository and
+    ``cache_folder`` points at a local (e.g. pre-baked) model cache.
+    """
+    # Imported here: pulling in torch/sentence-transformers dominates import time.
+    from llama_index.embeddings.huggingface import HuggingFaceEmbedding
+
+    if backend not in EMBED_BACKENDS:
+        raise ValueError(f"Unsupported embedding backend: {backend}")
+
+    kwargs = {}
+    if backend == "torch":
+        if threads > 0:
+            import torch
+            torch.set_num_threads(threads)
+    else:
+        model_kwargs = {"provider": "CPUExecutionProvider"}
+        if onnx_file or backend == "onnx-int8":
+            model_kwargs["file_name"] = onnx_file or DEFAULT_ONNX_INT8_FILE
+        if threads > 0:
+            import onnxruntime
+            session_options = onnxruntime.SessionOptions()
+            session_options.intra_op_num_threads = threads
+            session_options.inter_op_num_threads = 1
+            model_kwargs["session_options"] = session_options
+        kwargs = {"backend": "onnx", "model_kwargs": model_kwargs}
+
+    start = time.perf_counter()
+    model = HuggingFaceEmbedding(
+        model_name=model_name,
+        embed_batch_size=max_batch_size,
+        cache_folder=cache_folder,
+        **kwargs,
+    )
+    logging.info(f"Loaded {model_name} with the {backend} backend in {time.perf_counter() - start:.2f}s")
+    return model
+
+
+def load_embed_model_from_env(model_name, max_batch_size):
+    """``load_embed_model`` configured by the EMBED_* settings."""
+    return load_embed_model(
+        model_name,
+        backend=os.getenv("EMBED_BACKEND", "torch").lower(),
+        threads=int(os.getenv("EMBED_THREADS", 0)),
+        max_batch_size=int(os.getenv("EMBED_MAX_BATCH_SIZE", max_batch_size)),
+        onnx_file=os.getenv("EMBED_ONNX_FILE") or None,
+        cache_folder=os.getenv("EMBED_MODEL_CACHE_DIR") or None,
+    )
+
+
+def warm_up(model):
+    """Run a query and a full batch through the model.
+
+    The first forward passes pay for graph initialization and buffer
+    allocation; doing them at startup keeps that off the first request.
+    """
+    start = time.perf_counter()
+    model.get_query_embedding("warm-up query")
+    model.get_text_embedding_batch(["warm-up passage"] * model.embed_batch_size)
+    logging.info(f"Embedding model warm-up took {time.perf_counter() - start:.2f}s")
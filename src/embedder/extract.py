@@ -0,0 +1,120 @@
+import logging
+import multiprocessing
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import pdfplumber
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool(workers):
+    """Lazily create the shared extraction process pool.
+
+    Workers are spawned rather than forked so they don't inherit the parent's
+    torch/OpenMP thread state.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+def _extract_pages(file_path, start, end):
+    """Extract the text of pages ``start``..``end - 1``. Runs in a worker process."""
+    texts = []
+    with pdfplumber.open(file_path) as pdf:
+        for page in pdf.pages[start:end]:
+            texts.append(page.extract_text() or "")
+            page.flush_cache()
+    return texts
+
+
+def _page_count(file_path):
+    with pdfplumber.open(file_path) as pdf:
+        return len(pdf.pages)
+
+
+def iter_pdf_pages(file_path, workers=0, window=16):
+    """Yield the text of each page of a PDF, in order, followed by a newline.
+
+    Pages whose text can't be extracted yield an empty string. With ``workers``
+    > 0 windows of ``window`` pages are extracted in parallel worker processes,
+    keeping at most ``2 * workers`` windows in flight so memory stays bounded
+    by the window size rather than by the document.
+    """
+    try:
+        if workers <= 0:
+            with pdfplumber.open(file_path) as pdf:
+                for page in pdf.pages:
+                    yield (page.extract_text() or "") + "\n"
+                    page.flush_cache()
+            return
+
+        pool = _get_pool(workers)
+        page_count = _page_count(file_path)
+        starts = iter(range(0, page_count, window))
+        in_flight = deque()
+
+        for start in starts:
+            in_flight.append(pool.submit(_extract_pages, file_path, start, min(start + window, page_count)))
+            if len(in_flight) >= 2 * workers:
+                break
+
+        while in_flight:
+            texts = in_flight.popleft().result()
+            start = next(starts, None)
+            if start is not None:
+                in_flight.append(pool.submit(_extract_pages, file_path, start, min(start + window, page_count)))
+            for text in texts:
+                yield text + "\n"
+    except Exception as e:
+        logging.error(f"Error reading PDF {file_path}: {str(e)}")
+        raise
+
+
+def iter_text_blocks(file_path, block_size=1 << 20):
+    """Yield a UTF-8 text file in blocks of ``block_size`` characters."""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        while True:
+            block = f.read(block_size)
+            if not block:
+                return
+            yield block
+
+
+def split_stream(pieces, splitter, window_chars=200_000):
+    """Split a stream of text pieces into chunks without holding the whole text.
+
+    Text is buffered until ``window_chars`` characters accumulate and then split.
+    All chunks but the last are emitted; the last, possibly incomplete, chunk is
+    carried over and split again together with the following text, so chunk
+    sizes and overlap across window boundaries match splitting the whole text.
+    """
+    buffer = []
+    size = 0
+    for piece in pieces:
+        if not piece:
+            continue
+        buffer.append(piece)
+        size += len(piece)
+        if size < window_chars:
+            continue
+
+        text = "".join(buffer)
+        chunks = splitter.split_text(text)
+        yield from chunks[:-1]
+        # Chunks are stripped, keep the whitespace separating them from the next piece.
+        trailing = text[len(text.rstrip()):]
+        buffer = [chunks[-1] + trailing] if chunks else []
+        size = len(buffer[0]) if buffer else 0
+
+    if buffer:
+        yield from splitter.split_text("".join(buffer))
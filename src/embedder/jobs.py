@@ -0,0 +1,330 @@
+import logging
+import threading
+import time
+import traceback
+
+from sqlalchemy import text
+
+
+JOB_STATES = ("queued", "running", "done", "skipped", "failed")
+JOB_ACTIONS = ("index", "delete")
+
+RESULT_STATES = {
+    "processed": "done",
+    "skipped": "skipped",
+    "error": "failed",
+}
+
+JOB_COLUMNS = """
+    id, bucket, object_key, action, event_name, etag, state, attempts, chunks, reason, error,
+    created_at, started_at, heartbeat_at, finished_at
+"""
+
+# Serializes claims across workers and replicas, see JobQueue.claim.
+CLAIM_LOCK_KEY = 7_301_001
+
+
+def job_to_dict(row):
+    """Serialize an ingest_jobs row, adding queue and processing timings."""
+    job = dict(row._mapping)
+    created_at, started_at, finished_at = job["created_at"], job["started_at"], job["finished_at"]
+    job["queued_seconds"] = (started_at - created_at).total_seconds() if started_at else None
+    job["processing_seconds"] = (
+        (finished_at - started_at).total_seconds() if started_at and finished_at else None
+    )
+    for key in ("created_at", "started_at", "heartbeat_at", "finished_at"):
+        job[key] = job[key].isoformat() if job[key] else None
+    return job
+
+
+# Columns added since the first version of the ingest_jobs table.
+ADDED_COLUMNS = {
+    "action": "character varying NOT NULL DEFAULT 'index'",
+    "heartbeat_at": "timestamptz",
+}
+
+
+class JobQueue:
+    """Durable ingestion queue stored in the ``ingest_jobs`` Postgres table."""
+
+    def __init__(self, engine):
+        self.engine = engine
+
+    def ensure_schema(self):
+        with self.engine.begin() as connection:
+            connection.execute(text("""
+                CREATE TABLE IF NOT EXISTS public.ingest_jobs (
+                    id bigserial PRIMARY KEY,
+                    bucket character varying NOT NULL,
+                    object_key character varying NOT NULL,
+                    action character varying NOT NULL DEFAULT 'index',
+                    event_name character varying,
+                    etag character varying,
+                    state character varying NOT NULL DEFAULT 'queued',
+                    attempts integer NOT NULL DEFAULT 0,
+                    chunks integer,
+                    reason character varying,
+                    error text,
+                    created_at timestamptz NOT NULL DEFAULT now(),
+                    started_at timestamptz,
+                    heartbeat_at timestamptz,
+                    finished_at timestamptz
+                )
+            """))
+            existing = {name for name, in connection.execute(text("""
+                SELECT column_name FROM information_schema.columns
+                WHERE table_schema = 'public' AND table_name = 'ingest_jobs'
+            """))}
+            missing = [name for name in ADDED_COLUMNS if name not in existing]
+            if missing:
+                connection.execute(text(
+                    "ALTER TABLE public.ingest_jobs "
+                    + ", ".join(f"ADD COLUMN {name} {ADDED_COLUMNS[name]}" for name in missing)
+                ))
+            connection.execute(text("""
+                CREATE INDEX IF NOT EXISTS ingest_jobs_state_idx
+                ON public.ingest_jobs USING btree (state, id)
+            """))
+            connection.execute(text("""
+                CREATE INDEX IF NOT EXISTS ingest_jobs_object_idx
+                ON public.ingest_jobs USING btree (bucket, object_key, state)
+            """))
+
+    def enqueue(self, bucket, object_key, action="index", event_name=None, etag=None):
+        """Queue an object for ingestion (``action="index"``) or removal (``"delete"``).
+
+        Returns ``(job_id, created)``. Redelivered notifications for an object that
+        is still queued or running return the existing job instead of a new one.
+        """
+        params = {"bucket": bucket, "object_key": object_key, "action": action,
+                  "event_name": event_name, "etag": etag}
+        with self.engine.begin() as connection:
+            job_id = connection.execute(text("""
+                INSERT INTO ingest_jobs (bucket, object_key, action, event_name, etag)
+                SELECT :bucket, :object_key, :action, :event_name, :etag
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM ingest_jobs
+                    WHERE bucket = :bucket
+                      AND object_key = :object_key
+                      AND action = :action
+                      AND etag IS NOT DISTINCT FROM :etag
+                      AND state IN ('queued', 'running')
+                )
+                RETURNING id
+            """), params).scalar()
+            if job_id is not None:
+                return job_id, True
+
+            job_id = connection.execute(text("""
+                SELECT id FROM ingest_jobs
+                WHERE bucket = :bucket
+                  AND object_key = :object_key
+                  AND action = :action
+                  AND etag IS NOT DISTINCT FROM :etag
+                  AND state IN ('queued', 'running')
+                ORDER BY id DESC
+                LIMIT 1
+            """), params).scalar()
+            return job_id, False
+
+    def claim(self):
+        """Atomically move the oldest claimable queued job to ``running`` and return it.
+
+        Jobs of one object run one at a time and in order: a job is skipped
+        while another job for the same object is running or queued before it,
+        so a delete never overtakes an index still waiting for its batch and
+        two quick overwrites are not ingested concurrently. Claims take a
+        transaction-level advisory lock so concurrent claimers see each
+        other's ``running`` jobs.
+        """
+        with self.engine.begin() as connection:
+            connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": CLAIM_LOCK_KEY})
+            row = connection.execute(text(f"""
+                UPDATE ingest_jobs
+                SET state = 'running', started_at = now(), heartbeat_at = now(), attempts = attempts + 1
+                WHERE id = (
+                    SELECT id FROM ingest_jobs queued
+                    WHERE state = 'queued'
+                      AND NOT EXISTS (
+                          SELECT 1 FROM ingest_jobs other
+                          WHERE other.bucket = queued.bucket
+                            AND other.object_key = queued.object_key
+                            AND (other.state = 'running'
+                                 OR (other.state = 'queued' AND other.id < queued.id))
+                      )
+                    ORDER BY id
+                    FOR UPDATE SKIP LOCKED
+                    LIMIT 1
+                )
+                RETURNING {JOB_COLUMNS}
+            """)).first()
+            return job_to_dict(row) if row else None
+
+    def heartbeat(self, job_ids):
+        """Extend the lease of running jobs that are still in flight."""
+        if not job_ids:
+            return
+        with self.engine.begin() as connection:
+            connection.execute(text("""
+                UPDATE ingest_jobs SET heartbeat_at = now()
+                WHERE id = ANY(:ids) AND state = 'running'
+            """), {"ids": list(job_ids)})
+
+    def finish(self, job_id, state, chunks=None, reason=None, error=None):
+        with self.engine.begin() as connection:
+            connection.execute(text("""
+                UPDATE ingest_jobs
+                SET state = :state, chunks = :chunks, reason = :reason, error = :error,
+                    finished_at = now()
+                WHERE id = :id
+            """), {"id": job_id, "state": state, "chunks": chunks, "reason": reason, "error": error})
+
+    def requeue_stale(self, max_age, max_attempts):
+        """Return ``running`` jobs whose lease expired (e.g. after a crash) to the queue.
+
+        In-flight jobs keep their lease fresh through ``heartbeat``, however
+        long they take.
+        """
+        with self.engine.begin() as connection:
+            result = connection.execute(text("""
+                UPDATE ingest_jobs
+                SET state = CASE WHEN attempts >= :max_attempts THEN 'failed' ELSE 'queued' END,
+                    error = CASE WHEN attempts >= :max_attempts
+                                 THEN 'worker did not finish the job' ELSE error END,
+                    finished_at = CASE WHEN attempts >= :max_attempts THEN now() ELSE NULL END
+                WHERE state = 'running'
+                  AND COALESCE(heartbeat_at, started_at) < now() - make_interval(secs => :max_age)
+            """), {"max_age": max_age, "max_attempts": max_attempts})
+            return result.rowcount
+
+    def get(self, job_id):
+        with self.engine.connect() as connection:
+            row = connection.execute(
+                text(f"SELECT {JOB_COLUMNS} FROM ingest_jobs WHERE id = :id"),
+                {"id": job_id}
+            ).first()
+            return job_to_dict(row) if row else None
+
+    def list(self, state=None, limit=50, offset=0):
+        with self.engine.connect() as connection:
+            rows = connection.execute(text(f"""
+                SELECT {JOB_COLUMNS} FROM ingest_jobs
+                WHERE (CAST(:state AS varchar) IS NULL OR state = :state)
+                ORDER BY id DESC
+                LIMIT :limit OFFSET :offset
+            """), {"state": state, "limit": limit, "offset": offset})
+            return [job_to_dict(row) for row in rows]
+
+    def counts(self):
+        with self.engine.connect() as connection:
+            rows = connection.execute(text("SELECT state, COUNT(*) FROM ingest_jobs GROUP BY state"))
+            return {state: count for state, count in rows}
+
+
+class JobWorkers:
+    """Background threads that drain a ``JobQueue``.
+
+    ``handler(job)`` must return a ``(result, pending)`` tuple as produced by
+    ``process_file_from_minio``. When ``pending`` is a future the job is only
+    marked finished once its chunks are stored, so workers can move on to the
+    next file while earlier chunks wait for a full embedding batch. Until then
+    a heartbeat thread keeps the lease of every in-flight job fresh, so only
+    jobs of a dead worker are requeued after ``stale_after`` seconds.
+    """
+
+    def __init__(self, queue, handler, concurrency=4, poll_interval=1.0,
+                 stale_after=300, max_attempts=3):
+        self.queue = queue
+        self.handler = handler
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.stale_after = stale_after
+        self.max_attempts = max_attempts
+        self._wakeup = threading.Event()
+        self._threads = []
+        self._in_flight = set()
+        self._in_flight_lock = threading.Lock()
+
+    def start(self):
+        requeued = self.queue.requeue_stale(self.stale_after, self.max_attempts)
+        if requeued:
+            logging.info(f"Requeued {requeued} stale ingestion jobs")
+        for i in range(self.concurrency):
+            thread = threading.Thread(target=self._run, name=f"ingest-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        heartbeat = threading.Thread(target=self._run_heartbeat, name="ingest-heartbeat", daemon=True)
+        heartbeat.start()
+        self._threads.append(heartbeat)
+
+    def notify(self):
+        """Wake idle workers after new jobs were queued."""
+        self._wakeup.set()
+
+    def _run(self):
+        while True:
+            try:
+                job = self.queue.claim()
+            except Exception as e:
+                logging.error(f"Error claiming ingestion job: {str(e)}")
+                job = None
+
+            if job is None:
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+                try:
+                    self.queue.requeue_stale(self.stale_after, self.max_attempts)
+                except Exception as e:
+                    logging.error(f"Error requeueing stale jobs: {str(e)}")
+                continue
+
+            self._process(job)
+
+    def _run_heartbeat(self):
+        while True:
+            time.sleep(max(1.0, self.stale_after / 5))
+            with self._in_flight_lock:
+                job_ids = list(self._in_flight)
+            try:
+                self.queue.heartbeat(job_ids)
+            except Exception as e:
+                logging.error(f"Error refreshing ingestion job leases: {str(e)}")
+
+    def _process(self, job):
+        job_id = job["id"]
+        with self._in_flight_lock:
+            self._in_flight.add(job_id)
+        try:
+            result, pending = self.handler(job)
+        except Exception as e:
+            logging.error(f"Error running ingestion job {job_id}: {str(e)}")
+            logging.error(traceback.format_exc())
+            self._finish(job_id, "failed", error=str(e))
+            return
+
+        state = RESULT_STATES.get(result.get("status"), "done")
+        if pending is None:
+            self._finish(job_id, state, chunks=result.get("chunks"),
+                         reason=result.get("reason"), error=result.get("error"))
+            return
+
+        def on_stored(future):
+            error = future.exception()
+            if error is not None:
+                self._finish(job_id, "failed", error=str(error))
+            else:
+                logging.info(f"Successfully indexed {future.result()} chunks from {job['object_key']}")
+                self._finish(job_id, state, chunks=future.result())
+
+        pending.add_done_callback(on_stored)
+
+    def _finish(self, job_id, state, **kwargs):
+        try:
+            self.queue.finish(job_id, state, **kwargs)
+        except Exception as e:
+            logging.error(f"Error updating ingestion job {job_id}: {str(e)}")
+        finally:
+            with self._in_flight_lock:
+                self._in_flight.discard(job_id)
+        # A job of the same object may have been waiting for this one.
+        self.notify()
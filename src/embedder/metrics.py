@@ -0,0 +1,90 @@
+import time
+
+from fastapi import Response
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Histogram, generate_latest
+
+
+FILES_PROCESSED = Counter("files_processed_total", "Files whose chunks were indexed")
+FILES_ERROR = Counter("files_error_total", "Files that failed to be indexed")
+FILES_SKIPPED = Counter("files_skipped_total", "Files skipped without indexing", ["reason"])
+CHUNKS_CREATED = Counter("chunks_created_total", "Chunks inserted into the vector table")
+MINIO_EVENTS = Counter("minio_events_received_total", "MinIO notification records received", ["action"])
+FILE_PROCESSING_DURATION = Histogram(
+    "file_processing_duration_seconds",
+    "Time from download until all chunks of a file are stored",
+    ["file_type"],
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0),
+)
+EMBEDDING_DURATION = Histogram(
+    "embedding_duration_seconds",
+    "Duration of an embedding batch by batch size",
+    ["chunk_count"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+)
+INGEST_STAGE_DURATION = Histogram(
+    "ingest_stage_duration_seconds",
+    "Time spent in each stage of ingestion",
+    ["stage"],
+    buckets=(0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0),
+)
+REQUEST_DURATION = Histogram(
+    "request_duration_seconds",
+    "HTTP request duration by route",
+    ["endpoint", "method"],
+)
+HTTP_REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP requests by route and status code",
+    ["endpoint", "status"],
+)
+
+
+def instrument_app(app):
+    """Record request metrics for every route and serve them at ``/metrics``.
+
+    Requests are labelled with the route template rather than the raw path to
+    keep label cardinality bounded.
+    """
+    @app.middleware("http")
+    async def record_request(request, call_next):
+        start = time.perf_counter()
+        status = 500
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            return response
+        finally:
+            route = request.scope.get("route")
+            endpoint = route.path if route is not None else "unmatched"
+            REQUEST_DURATION.labels(endpoint, request.method).observe(time.perf_counter() - start)
+            HTTP_REQUESTS.labels(endpoint, str(status)).inc()
+
+    @app.get("/metrics", include_in_schema=False)
+    def metrics_handler():
+        return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
+def batch_size_label(count):
+    """Bucket a batch size into a small set of label values."""
+    for bound in (1, 8, 32, 128, 512):
+        if count <= bound:
+            return f"<={bound}"
+    return ">512"
+
+
+class TimedIterator:
+    """Iterator wrapper accumulating the time spent producing its items."""
+
+    def __init__(self, iterable):
+        self._iterator = iter(iterable)
+        self.seconds = 0.0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        start = time.perf_counter()
+        try:
+            return next(self._iterator)
+        finally:
+            self.seconds += time.perf_counter() - start
@@ -0,0 +1,283 @@
+import logging
+import math
+import time
+
+from sqlalchemy import text
+
+
+VECTOR_TABLE = "data_llamaindex"
+VECTOR_INDEX_NAME = "data_llamaindex_embedding_idx"
+VECTOR_INDEX_TYPES = ("hnsw", "ivfflat", "none")
+
+
+class VectorIndexConfig:
+    """Parameters of the ANN index on ``data_llamaindex.embedding``.
+
+    ``lists`` of 0 means "derive from the row count" (rows / 1000 up to 1M rows,
+    sqrt(rows) above), as recommended by pgvector.
+    """
+
+    def __init__(self, index_type="hnsw", m=16, ef_construction=64, lists=0):
+        if index_type not in VECTOR_INDEX_TYPES:
+            raise ValueError(f"Unsupported vector index type: {index_type}")
+        self.index_type = index_type
+        self.m = m
+        self.ef_construction = ef_construction
+        self.lists = lists
+
+    def ivfflat_lists(self, row_count):
+        if self.lists:
+            return self.lists
+        if row_count <= 1_000_000:
+            return max(1, row_count // 1000)
+        return int(math.sqrt(row_count))
+
+    def create_statement(self, index_name, row_count, concurrently=False):
+        using = {
+            "hnsw": f"hnsw (embedding vector_cosine_ops) WITH (m = {int(self.m)}, ef_construction = {int(self.ef_construction)})",
+            "ivfflat": f"ivfflat (embedding vector_cosine_ops) WITH (lists = {int(self.ivfflat_lists(row_count))})",
+        }[self.index_type]
+        return (
+            f"CREATE INDEX {'CONCURRENTLY ' if concurrently else ''}IF NOT EXISTS {index_name} "
+            f"ON public.{VECTOR_TABLE} USING {using}"
+        )
+
+
+# Columns and indexes added to tables of databases created before the current
+# init_db.sql, by table. Index names are prefixed with the table name.
+SCHEMA_COLUMNS = {
+    VECTOR_TABLE: {
+        "filepath": "character varying GENERATED ALWAYS AS (metadata_->>'filepath') STORED",
+        "filename": "character varying GENERATED ALWAYS AS (metadata_->>'filename') STORED",
+        "chunk_hash": "character varying GENERATED ALWAYS AS (metadata_->>'chunk_hash') STORED",
+        "text_search": "tsvector GENERATED ALWAYS AS (to_tsvector('english', text)) STORED",
+        "file_type": (
+            "character varying GENERATED ALWAYS AS "
+            "(lower(substring(metadata_->>'filename' FROM '[.]([^./]+)$'))) STORED"
+        ),
+        "ingested_at": "timestamptz NOT NULL DEFAULT now()",
+    },
+    "documents": {
+        "file_type": "character varying GENERATED ALWAYS AS (lower(substring(filename FROM '[.]([^./]+)$'))) STORED",
+    },
+}
+
+SCHEMA_INDEXES = {
+    VECTOR_TABLE: {
+        "filepath": "btree (filepath)",
+        "filepath_prefix": "btree (filepath varchar_pattern_ops)",
+        "filename": "btree (filename)",
+        "file_type": "btree (file_type)",
+        "ingested_at": "btree (ingested_at)",
+        "chunk_hash": "btree (chunk_hash)",
+        "text_search": "gin (text_search)",
+    },
+    "documents": {
+        "filename": "btree (filename)",
+        "file_type": "btree (file_type)",
+        "ingested_at": "btree (ingested_at)",
+        "chunk_count": "btree (chunk_count, id)",
+        "search": "gin (lower(filename || ' ' || filepath) gin_trgm_ops)",
+    },
+}
+
+
+def _existing_tables(connection):
+    return {name for name, in connection.execute(text("""
+        SELECT table_name FROM information_schema.tables WHERE table_schema = 'public'
+    """))}
+
+
+def missing_columns(connection, table, columns):
+    """Names among ``columns`` that ``table`` doesn't have yet."""
+    existing = {name for name, in connection.execute(text("""
+        SELECT column_name FROM information_schema.columns
+        WHERE table_schema = 'public' AND table_name = :table
+    """), {"table": table})}
+    return [name for name in columns if name not in existing]
+
+
+def _valid_indexes(connection):
+    """Names of the valid indexes; a failed concurrent build leaves an invalid one."""
+    return {name for name, in connection.execute(text("""
+        SELECT c.relname
+        FROM pg_index i
+        JOIN pg_class c ON c.oid = i.indexrelid
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = 'public' AND i.indisvalid
+    """))}
+
+
+def check_schema(engine):
+    """Describe what ``migrate_schema`` would change; empty when up to date.
+
+    Only reads the catalogs, so it takes no table locks.
+    """
+    with engine.connect() as connection:
+        tables = _existing_tables(connection)
+        indexes = _valid_indexes(connection)
+        missing = [
+            f"table {table}" for table in ("documents", "corpus_version") if table not in tables
+        ]
+        for table, columns in SCHEMA_COLUMNS.items():
+            if table in tables:
+                missing.extend(f"column {table}.{name}" for name in missing_columns(connection, table, columns))
+        for table, table_indexes in SCHEMA_INDEXES.items():
+            missing.extend(
+                f"index {table}_{name}_idx" for name in table_indexes if f"{table}_{name}_idx" not in indexes
+            )
+        return missing
+
+
+def migrate_schema(engine):
+    """Bring a database created before the current init_db.sql up to date.
+
+    Adds the missing generated columns of ``data_llamaindex`` and
+    ``documents``, creates the ``corpus_version`` counter and the ``documents``
+    table, backfilling the latter from existing chunks, then builds the
+    missing indexes concurrently so writes are not blocked. Adding a stored
+    generated column rewrites the table under an exclusive lock, so on a large
+    corpus run this once before rolling out (``scripts/migrate_schema.py``).
+    """
+    with engine.begin() as connection:
+        connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm WITH SCHEMA public"))
+        tables = _existing_tables(connection)
+        if "documents" not in tables:
+            connection.execute(text("""
+                CREATE TABLE public.documents (
+                    id bigserial PRIMARY KEY,
+                    filepath character varying NOT NULL UNIQUE,
+                    filename character varying NOT NULL,
+                    content_hash character varying,
+                    chunk_count integer NOT NULL DEFAULT 0,
+                    ingested_at timestamptz NOT NULL DEFAULT now(),
+                    file_type character varying
+                        GENERATED ALWAYS AS (lower(substring(filename FROM '[.]([^./]+)$'))) STORED
+                )
+            """))
+        if "corpus_version" not in tables:
+            connection.execute(text("""
+                CREATE TABLE public.corpus_version (
+                    id integer PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+                    version bigint NOT NULL DEFAULT 0,
+                    updated_at timestamptz NOT NULL DEFAULT now()
+                )
+            """))
+            connection.execute(text("INSERT INTO public.corpus_version (id) VALUES (1)"))
+
+        for table, columns in SCHEMA_COLUMNS.items():
+            missing = missing_columns(connection, table, columns)
+            if missing:
+                logging.warning(f"Adding columns {', '.join(missing)} to {table}, rewriting the table")
+                connection.execute(text(
+                    f"ALTER TABLE public.{table} "
+                    + ", ".join(f"ADD COLUMN {name} {columns[name]}" for name in missing)
+                ))
+
+        if "documents" not in tables:
+            backfilled = connection.execute(text(f"""
+                INSERT INTO public.documents (filepath, filename, chunk_count)
+                SELECT filepath, COALESCE(MIN(filename), filepath), COUNT(*)
+                FROM public.{VECTOR_TABLE}
+                WHERE filepath IS NOT NULL
+                GROUP BY filepath
+                ON CONFLICT (filepath) DO NOTHING
+            """)).rowcount
+            if backfilled:
+                logging.info(f"Backfilled {backfilled} rows into documents")
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        indexes = _valid_indexes(connection)
+        for table, table_indexes in SCHEMA_INDEXES.items():
+            for name, definition in table_indexes.items():
+                index_name = f"{table}_{name}_idx"
+                if index_name in indexes:
+                    continue
+                start = time.perf_counter()
+                connection.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS public.{index_name}"))
+                connection.execute(text(
+                    f"CREATE INDEX CONCURRENTLY {index_name} ON public.{table} USING {definition}"
+                ))
+                logging.info(f"Built index {index_name} in {time.perf_counter() - start:.1f}s")
+
+
+def ensure_schema(engine, auto_migrate=True):
+    """Migrate the schema if it is out of date, or fail when ``auto_migrate`` is off.
+
+    Up-to-date databases only have their catalogs read, so restarts take no
+    locks on the chunk table.
+    """
+    missing = check_schema(engine)
+    if not missing:
+        return
+    if not auto_migrate:
+        raise RuntimeError(
+            f"Database schema is out of date ({', '.join(missing)}), run scripts/migrate_schema.py"
+        )
+    logging.warning(f"Database schema is out of date, migrating: {', '.join(missing)}")
+    migrate_schema(engine)
+
+
+def _row_count(connection):
+    return connection.execute(text(f"SELECT COUNT(*) FROM public.{VECTOR_TABLE}")).scalar()
+
+
+def _index_definition(connection, index_name):
+    return connection.execute(text("""
+        SELECT indexdef FROM pg_indexes
+        WHERE schemaname = 'public' AND indexname = :name
+    """), {"name": index_name}).scalar()
+
+
+def ensure_vector_index(engine, config):
+    """Create the ANN index if it is missing. Existing indexes are left untouched.
+
+    The index is built concurrently, so ingestion can keep writing meanwhile.
+    """
+    if config.index_type == "none":
+        return
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        definition = _index_definition(connection, VECTOR_INDEX_NAME)
+        if definition is not None:
+            if f"USING {config.index_type}" not in definition:
+                logging.warning(
+                    f"Vector index {VECTOR_INDEX_NAME} does not match VECTOR_INDEX_TYPE={config.index_type}, "
+                    f"call /admin/reindex to rebuild it"
+                )
+            return
+        row_count = _row_count(connection)
+        if config.index_type == "ivfflat" and row_count == 0:
+            logging.info("Skipping IVFFlat index creation until the table has data")
+            return
+        logging.info(f"Creating {config.index_type} index {VECTOR_INDEX_NAME} on {row_count} rows")
+        connection.execute(text(config.create_statement(VECTOR_INDEX_NAME, row_count, concurrently=True)))
+
+
+def rebuild_vector_index(engine, config):
+    """Rebuild the ANN index without blocking writes, then swap it in.
+
+    The new index is built concurrently under a temporary name and renamed once
+    ready, so searches keep using the old index until the swap.
+    """
+    start = time.perf_counter()
+    new_index = f"{VECTOR_INDEX_NAME}_new"
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        row_count = _row_count(connection)
+        connection.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS public.{new_index}"))
+        if config.index_type != "none":
+            connection.execute(text(config.create_statement(new_index, row_count, concurrently=True)))
+        connection.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS public.{VECTOR_INDEX_NAME}"))
+        if config.index_type != "none":
+            connection.execute(text(f"ALTER INDEX public.{new_index} RENAME TO {VECTOR_INDEX_NAME}"))
+        connection.execute(text(f"ANALYZE public.{VECTOR_TABLE}"))
+        definition = _index_definition(connection, VECTOR_INDEX_NAME)
+
+    duration = time.perf_counter() - start
+    logging.info(f"Rebuilt vector index on {row_count} rows in {duration:.1f}s: {definition}")
+    return {
+        "index": VECTOR_INDEX_NAME if definition else None,
+        "type": config.index_type,
+        "definition": definition,
+        "rows": row_count,
+        "duration_seconds": round(duration, 3),
+    }
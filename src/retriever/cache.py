@@ -0,0 +1,135 @@
+import hashlib
+import logging
+import threading
+import time
+from array import array
+from collections import OrderedDict
+
+
+def normalize_query(query):
+    """Lowercase and collapse whitespace; the embedding model is uncased."""
+    return " ".join(query.lower().split())
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries also expire ``ttl`` seconds after insertion."""
+
+    def __init__(self, maxsize=10000, ttl=3600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return None
+
+    def set(self, key, value):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+class QueryEmbeddingCache:
+    """Caches query embeddings keyed on the model name and the normalized query.
+
+    Embeddings are kept locally as float32 arrays (~1.5 KB each for 384 dims).
+    When ``redis_url`` is set, local misses fall back to a Redis instance shared
+    by all retriever replicas, and new embeddings are written there as well.
+    """
+
+    def __init__(self, model_name, maxsize=10000, ttl=3600, redis_url=None):
+        self.model_name = model_name
+        self.local = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.ttl = ttl
+        self.shared_hits = 0
+        self.shared_errors = 0
+        self._redis = None
+        if redis_url:
+            import redis
+            self._redis = redis.Redis.from_url(redis_url, socket_timeout=0.1, socket_connect_timeout=0.1)
+
+    @property
+    def shared(self):
+        """Whether lookups may hit the shared Redis tier."""
+        return self._redis is not None
+
+    def _shared_key(self, query):
+        digest = hashlib.sha1(query.encode("utf-8")).hexdigest()
+        return f"rag-docs:query-embedding:{self.model_name}:{digest}"
+
+    def get(self, query):
+        """Return the cached embedding of a normalized query, or ``None``."""
+        embedding = self.local.get(query)
+        if embedding is not None:
+            return embedding.tolist()
+
+        if self._redis is None:
+            return None
+        try:
+            payload = self._redis.get(self._shared_key(query))
+        except Exception as e:
+            self.shared_errors += 1
+            logging.warning(f"Shared query cache unavailable: {str(e)}")
+            return None
+        if payload is None:
+            return None
+
+        embedding = array("f")
+        embedding.frombytes(payload)
+        self.local.set(query, embedding)
+        self.shared_hits += 1
+        return embedding.tolist()
+
+    def set(self, query, embedding):
+        embedding = array("f", embedding)
+        self.local.set(query, embedding)
+        if self._redis is None:
+            return
+        try:
+            self._redis.set(self._shared_key(query), embedding.tobytes(), ex=int(self.ttl))
+        except Exception as e:
+            self.shared_errors += 1
+            logging.warning(f"Shared query cache unavailable: {str(e)}")
+
+    def stats(self):
+        local = self.local.stats()
+        return {
+            "model": self.model_name,
+            **local,
+            "shared_backend": "redis" if self._redis is not None else None,
+            "shared_hits": self.shared_hits,
+            "shared_errors": self.shared_errors,
+            "embeddings_computed": local["misses"] - self.shared_hits,
+        }
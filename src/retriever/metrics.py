@@ -0,0 +1,55 @@
+import time
+
+from fastapi import Response
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Histogram, generate_latest
+
+
+SEARCH_DURATION = Histogram(
+    "search_duration_seconds",
+    "End-to-end duration of a search by number of results returned",
+    ["result_count"],
+)
+SEARCH_REQUESTS = Counter("search_requests_total", "Search queries received, batched queries included")
+SEARCH_ERRORS = Counter("search_errors_total", "Search queries that failed")
+FILES_LISTED = Counter("files_listed_total", "Requests listing the indexed files")
+SEARCH_STAGE_DURATION = Histogram(
+    "search_stage_duration_seconds",
+    "Time spent in each stage of a search",
+    ["stage"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+REQUEST_DURATION = Histogram(
+    "request_duration_seconds",
+    "HTTP request duration by route",
+    ["endpoint", "method"],
+)
+HTTP_REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP requests by route and status code",
+    ["endpoint", "status"],
+)
+
+
+def instrument_app(app):
+    """Record request metrics for every route and serve them at ``/metrics``.
+
+    Requests are labelled with the route template rather than the raw path to
+    keep label cardinality bounded.
+    """
+    @app.middleware("http")
+    async def record_request(request, call_next):
+        start = time.perf_counter()
+        status = 500
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            return response
+        finally:
+            route = request.scope.get("route")
+            endpoint = route.path if route is not None else "unmatched"
+            REQUEST_DURATION.labels(endpoint, request.method).observe(time.perf_counter() - start)
+            HTTP_REQUESTS.labels(endpoint, str(status)).inc()
+
+    @app.get("/metrics", include_in_schema=False)
+    def metrics_handler():
+        return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,93 @@
+import asyncio
+import logging
+import threading
+
+
+class MicroBatcher:
+    """Coalesce texts submitted by concurrent requests into batched embedding calls.
+
+    Texts wait at most ``max_wait_ms`` for others to arrive; a batch is started
+    as soon as ``max_batch_size`` texts are pending. ``embed_batch(texts)`` is a
+    blocking function run on ``executor``, so batches can overlap when the
+    executor has several workers. Identical texts pending at the same time are
+    embedded once. A caller submitting ``max_batch_size`` texts or more already
+    fills a batch, so its texts are embedded together in one call, unsplit.
+    """
+
+    def __init__(self, embed_batch, executor, max_batch_size=32, max_wait_ms=5.0):
+        self.embed_batch = embed_batch
+        self.executor = executor
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self._pending = []
+        self._timer = None
+        self._tasks = set()
+        self._stats_lock = threading.Lock()
+        self.batches = 0
+        self.texts = 0
+
+    async def embed(self, texts):
+        """Return the embeddings of ``texts`` in order."""
+        loop = asyncio.get_running_loop()
+        if len(texts) >= self.max_batch_size:
+            batch = [(text, loop.create_future()) for text in texts]
+            await self._run_batch(loop, batch)
+            return [future.result() for _, future in batch]
+
+        futures = []
+        for text in texts:
+            future = loop.create_future()
+            self._pending.append((text, future))
+            futures.append(future)
+
+        while len(self._pending) >= self.max_batch_size:
+            self._start_batch(loop)
+        if self._pending and self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._on_timer, loop)
+
+        return await asyncio.gather(*futures)
+
+    def _on_timer(self, loop):
+        self._timer = None
+        while self._pending:
+            self._start_batch(loop)
+
+    def _start_batch(self, loop):
+        batch = self._pending[:self.max_batch_size]
+        del self._pending[:self.max_batch_size]
+        if not self._pending and self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        task = loop.create_task(self._run_batch(loop, batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, loop, batch):
+        texts = list(dict.fromkeys(text for text, _ in batch))
+        try:
+            embeddings = await loop.run_in_executor(self.executor, self.embed_batch, texts)
+        except Exception as e:
+            logging.error(f"Error embedding batch of {len(texts)} queries: {str(e)}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        with self._stats_lock:
+            self.batches += 1
+            self.texts += len(texts)
+        by_text = dict(zip(texts, embeddings))
+        for text, future in batch:
+            if not future.done():
+                future.set_result(by_text[text])
+
+    def stats(self):
+        with self._stats_lock:
+            return {
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait * 1000,
+                "pending": len(self._pending),
+                "batches": self.batches,
+                "texts": self.texts,
+                "avg_batch_size": round(self.texts / self.batches, 2) if self.batches else 0.0,
+            }
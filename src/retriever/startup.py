@@ -0,0 +1,80 @@
+import asyncio
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+
+# Services import this module first, so the import time of the rest of the
+# service is included in the startup breakdown.
+IMPORTED_AT = time.perf_counter()
+
+
+class Startup:
+    """Tracks background startup phases and whether the service is ready.
+
+    ``started_at`` is a ``time.perf_counter()`` value, by default the time this
+    module was imported, so the import time shows up in the breakdown too.
+    """
+
+    def __init__(self, started_at=None, retry_interval=5.0):
+        self.started_at = IMPORTED_AT if started_at is None else started_at
+        self.retry_interval = retry_interval
+        self.phases = {"imports": time.perf_counter() - self.started_at}
+        self.current_phase = None
+        self.ready = False
+        self.error = None
+
+    @contextmanager
+    def phase(self, name):
+        self.current_phase = name
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = time.perf_counter() - start
+            self.current_phase = None
+
+    def _mark_ready(self):
+        self.ready = True
+        self.error = None
+        total = time.perf_counter() - self.started_at
+        breakdown = ", ".join(f"{name} {seconds:.2f}s" for name, seconds in self.phases.items())
+        logging.info(f"Ready after {total:.2f}s ({breakdown})")
+
+    def _failed(self, error):
+        self.error = f"{self.current_phase or 'startup'}: {error}"
+        logging.error(f"Startup failed in {self.error}, retrying in {self.retry_interval}s")
+
+    def start_thread(self, start):
+        """Run ``start()`` in a background thread, retrying until it succeeds."""
+        def run():
+            while True:
+                try:
+                    start()
+                    self._mark_ready()
+                    return
+                except Exception as e:
+                    self._failed(e)
+                    time.sleep(self.retry_interval)
+
+        threading.Thread(target=run, name="startup", daemon=True).start()
+
+    async def run_async(self, start):
+        """Await ``start()``, retrying until it succeeds."""
+        while True:
+            try:
+                await start()
+                self._mark_ready()
+                return
+            except Exception as e:
+                self._failed(e)
+                await asyncio.sleep(self.retry_interval)
+
+    def status(self):
+        return {
+            "status": "ready" if self.ready else "starting",
+            "phase": self.current_phase,
+            "error": self.error,
+            "phases": {name: round(seconds, 3) for name, seconds in self.phases.items()},
+        }
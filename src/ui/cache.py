@@ -0,0 +1,134 @@
+import hashlib
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+def normalize_question(question: str) -> str:
+    """Lowercase, collapse whitespace and drop trailing punctuation."""
+    return " ".join(question.lower().split()).rstrip("?!. ")
+
+def context_fingerprint(results: List[Dict[str, Any]]) -> str:
+    """Hash the ``(filepath, chunk_id)`` pairs of the retrieved chunks, in any order."""
+    ids = sorted(f"{r.get('filepath') or r.get('filename')}#{r.get('chunk_id')}" for r in results)
+    return hashlib.sha1("\n".join(ids).encode("utf-8")).hexdigest()
+
+def _cosine(a: List[float], b: List[float]) -> float:
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+class AnswerCache:
+    """
+    LRU cache of LLM answers whose entries expire ``ttl`` seconds after insertion.
+
+    Answers are keyed on the normalized question, the fingerprint of the
+    retrieved chunks and the LLM. The whole cache is dropped when the corpus
+    version reported by the retriever changes. When ``semantic_threshold`` > 0
+    and a question embedding is given, a question whose embedding has at least
+    that cosine similarity with a cached one, for the same chunks and LLM,
+    hits as well. Only entries for the same chunks and LLM are compared, and
+    the similarities are computed outside the lock.
+    """
+
+    def __init__(self, maxsize: int = 1000, ttl: float = 3600, semantic_threshold: float = 0.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.semantic_threshold = semantic_threshold
+        self.corpus_version = None
+        self._data = OrderedDict()
+        # (fingerprint, llm_id) -> keys of the entries answering from those chunks with that LLM.
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0
+
+    def _check_version(self, corpus_version: Optional[int]) -> bool:
+        """Drop every entry when the corpus changed; ``False`` if the version is unknown."""
+        if corpus_version is None:
+            return False
+        if corpus_version != self.corpus_version:
+            if self._data:
+                logger.info(f"Corpus version changed to {corpus_version}, clearing {len(self._data)} cached answers")
+            self._data.clear()
+            self._buckets.clear()
+            self.corpus_version = corpus_version
+        return True
+
+    def get(self, question: str, fingerprint: str, llm_id: str, corpus_version: Optional[int],
+            embedding: Optional[List[float]] = None) -> Optional[str]:
+        """Return the cached answer, or ``None``."""
+        if not self.enabled:
+            return None
+        key = (normalize_question(question), fingerprint, llm_id)
+        now = time.monotonic()
+        with self._lock:
+            if not self._check_version(corpus_version):
+                return None
+
+            entry = self._data.get(key)
+            if entry is not None and entry[2] > now:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+
+            candidates = []
+            if embedding is not None and self.semantic_threshold > 0:
+                for other_key in self._buckets.get((fingerprint, llm_id), ()):
+                    other_entry = self._data[other_key]
+                    if other_entry[2] > now and other_entry[1] is not None:
+                        candidates.append((other_key, other_entry))
+
+        for other_key, other_entry in candidates:
+            if _cosine(embedding, other_entry[1]) >= self.semantic_threshold:
+                with self._lock:
+                    # Refresh recency unless the entry was replaced or evicted meanwhile.
+                    if self._data.get(other_key) is other_entry:
+                        self._data.move_to_end(other_key)
+                    self.semantic_hits += 1
+                return other_entry[0]
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, question: str, fingerprint: str, llm_id: str, corpus_version: Optional[int],
+            answer: str, embedding: Optional[List[float]] = None):
+        if not self.enabled:
+            return
+        key = (normalize_question(question), fingerprint, llm_id)
+        with self._lock:
+            if not self._check_version(corpus_version):
+                return
+            self._data[key] = (answer, embedding, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+            self._buckets.setdefault(key[1:], set()).add(key)
+            while len(self._data) > self.maxsize:
+                evicted, _ = self._data.popitem(last=False)
+                bucket = self._buckets[evicted[1:]]
+                bucket.discard(evicted)
+                if not bucket:
+                    del self._buckets[evicted[1:]]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.semantic_hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl,
+                "corpus_version": self.corpus_version,
+                "hits": self.hits,
+                "semantic_hits": self.semantic_hits,
+                "misses": self.misses,
+                "hit_ratio": round((self.hits + self.semantic_hits) / lookups, 4) if lookups else 0.0,
+            }
@@ -1,54 +1,79 @@
-import os
-
-# LLM Configuration
-LLM_PROVIDER = os.getenv("LLM_PROVIDER", "ollama").lower()
-OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
-OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "llama3.1:8b")
-OPENAI_API_BASE = os.getenv("OPENAI_API_BASE", "https://api.openai.com/v1")
-OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-3.5-turbo")
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
-
-# Storage Configuration
-S3_ENDPOINT = os.getenv("S3_ENDPOINT", "http://localhost:9000")
-S3_PUBLIC_URL = os.getenv("S3_PUBLIC_URL", "http://localhost:9000")
-S3_ACCESS_KEY = os.getenv("S3_ACCESS_KEY", "minioadmin")
-S3_SECRET_KEY = os.getenv("S3_SECRET_KEY", "minioadmin")
-MINIO_BUCKET = os.getenv("MINIO_BUCKET", "documents")
-
-# Retriever Configuration
-RETRIEVER_API_URL = os.getenv("RETRIEVER_API_URL", "http://localhost:5001")
-SIMILARITY_THRESHOLD = float(os.getenv("SIMILARITY_THRESHOLD", 0.25))
-PRESIGNED_URL_EXPIRATION = int(os.getenv("PRESIGNED_URL_EXPIRATION", 3600))
-
-# UI Configuration
-SERVER_HOST = os.getenv("SERVER_HOST", "0.0.0.0")
-SERVER_PORT = int(os.getenv("SERVER_PORT", 3000))
-
-
-VIEWABLE_MIMETYPES = [
-    'text/plain', 'text/html', 'text/css', 'text/javascript',
-    'application/pdf', 'image/jpeg', 'image/png', 'image/gif',
-    'image/svg+xml'
-]
-
-def get_env_vars_by_category():
-    """Return environment variables organized by category for UI display"""
-    return {
-        "LLM Configuration": {
-            "LLM_PROVIDER": LLM_PROVIDER,
-            "OLLAMA_BASE_URL": OLLAMA_BASE_URL,
-            "OLLAMA_MODEL": OLLAMA_MODEL,
-            "OPENAI_API_BASE": OPENAI_API_BASE,
-            "OPENAI_MODEL": OPENAI_MODEL,
-        },
-        "Storage Configuration": {
-            "S3_ENDPOINT": S3_ENDPOINT,
-            "S3_PUBLIC_URL": S3_PUBLIC_URL,
-            "MINIO_BUCKET": MINIO_BUCKET,
-        },
-        "Retriever Configuration": {
-            "RETRIEVER_API_URL": RETRIEVER_API_URL,
-            "SIMILARITY_THRESHOLD": SIMILARITY_THRESHOLD,
-            "PRESIGNED_URL_EXPIRATION": PRESIGNED_URL_EXPIRATION,
-        }
-    }
+import os
+
+# LLM Configuration
+LLM_PROVIDER = os.getenv("LLM_PROVIDER", "ollama").lower()
+OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
+OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "llama3.1:8b")
+OPENAI_API_BASE = os.getenv("OPENAI_API_BASE", "https://api.openai.com/v1")
+OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-3.5-turbo")
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
+
+# Storage Configuration
+S3_ENDPOINT = os.getenv("S3_ENDPOINT", "http://localhost:9000")
+S3_PUBLIC_URL = os.getenv("S3_PUBLIC_URL", "http://localhost:9000")
+S3_ACCESS_KEY = os.getenv("S3_ACCESS_KEY", "minioadmin")
+S3_SECRET_KEY = os.getenv("S3_SECRET_KEY", "minioadmin")
+MINIO_BUCKET = os.getenv("MINIO_BUCKET", "documents")
+
+# Retriever Configuration
+RETRIEVER_API_URL = os.getenv("RETRIEVER_API_URL", "http://localhost:5001")
+SIMILARITY_THRESHOLD = float(os.getenv("SIMILARITY_THRESHOLD", 0.25))
+PRESIGNED_URL_EXPIRATION = int(os.getenv("PRESIGNED_URL_EXPIRATION", 3600))
+FILES_PAGE_SIZE = int(os.getenv("FILES_PAGE_SIZE", 50))
+CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", 2000))
+CONTEXT_DEDUP_THRESHOLD = float(os.getenv("CONTEXT_DEDUP_THRESHOLD", 0.8))
+
+# HTTP Client Configuration
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", 3))
+RETRIEVER_SEARCH_TIMEOUT = float(os.getenv("RETRIEVER_SEARCH_TIMEOUT", 30))
+RETRIEVER_FILES_TIMEOUT = float(os.getenv("RETRIEVER_FILES_TIMEOUT", 10))
+OLLAMA_TAGS_TIMEOUT = float(os.getenv("OLLAMA_TAGS_TIMEOUT", 5))
+HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", 2))
+HTTP_RETRY_BACKOFF = float(os.getenv("HTTP_RETRY_BACKOFF", 0.2))
+CIRCUIT_BREAKER_FAILURES = int(os.getenv("CIRCUIT_BREAKER_FAILURES", 5))
+CIRCUIT_BREAKER_RESET_TIMEOUT = float(os.getenv("CIRCUIT_BREAKER_RESET_TIMEOUT", 30))
+OLLAMA_MODELS_CACHE_TTL = float(os.getenv("OLLAMA_MODELS_CACHE_TTL", 15))
+
+# Answer Cache Configuration
+ANSWER_CACHE_SIZE = int(os.getenv("ANSWER_CACHE_SIZE", 1000))
+ANSWER_CACHE_TTL = int(os.getenv("ANSWER_CACHE_TTL", 3600))
+ANSWER_CACHE_SEMANTIC_THRESHOLD = float(os.getenv("ANSWER_CACHE_SEMANTIC_THRESHOLD", 0))
+
+# UI Configuration
+SERVER_HOST = os.getenv("SERVER_HOST", "0.0.0.0")
+SERVER_PORT = int(os.getenv("SERVER_PORT", 3000))
+
+
+VIEWABLE_MIMETYPES = [
+    'text/plain', 'text/html', 'text/css', 'text/javascript',
+    'application/pdf', 'image/jpeg', 'image/png', 'image/gif',
+    'image/svg+xml'
+]
+
+def get_env_vars_by_category():
+    """Return environment variables organized by category for UI display"""
+    return {
+        "LLM Configuration": {
+            "LLM_PROVIDER": LLM_PROVIDER,
+            "OLLAMA_BASE_URL": OLLAMA_BASE_URL,
+            "OLLAMA_MODEL": OLLAMA_MODEL,
+            "OPENAI_API_BASE": OPENAI_API_BASE,
+            "OPENAI_MODEL": OPENAI_MODEL,
+        },
+        "Storage Configuration": {
+            "S3_ENDPOINT": S3_ENDPOINT,
+            "S3_PUBLIC_URL": S3_PUBLIC_URL,
+            "MINIO_BUCKET": MINIO_BUCKET,
+        },
+        "Retriever Configuration": {
+            "RETRIEVER_API_URL": RETRIEVER_API_URL,
+            "SIMILARITY_THRESHOLD": SIMILARITY_THRESHOLD,
+            "PRESIGNED_URL_EXPIRATION": PRESIGNED_URL_EXPIRATION,
+            "FILES_PAGE_SIZE": FILES_PAGE_SIZE,
+            "CONTEXT_TOKEN_BUDGET": CONTEXT_TOKEN_BUDGET,
+            "CONTEXT_DEDUP_THRESHOLD": CONTEXT_DEDUP_THRESHOLD,
+            "ANSWER_CACHE_SIZE": ANSWER_CACHE_SIZE,
+            "ANSWER_CACHE_TTL": ANSWER_CACHE_TTL,
+            "ANSWER_CACHE_SEMANTIC_THRESHOLD": ANSWER_CACHE_SEMANTIC_THRESHOLD,
+        }
+    }
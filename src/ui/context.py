@@ -0,0 +1,136 @@
+import logging
+import re
+from typing import Dict, Any, List, Optional
+from llama_index.core.utils import get_tokenizer
+import config
+
+logger = logging.getLogger(__name__)
+
+# Longest text shared by two consecutive chunks; the embedder overlaps them by 50 tokens.
+MAX_OVERLAP_CHARS = 2000
+
+_tokenizer = None
+
+def count_tokens(text: str) -> int:
+    """Count tokens with the llama_index default tokenizer (an estimate for non-OpenAI models)."""
+    global _tokenizer
+    if _tokenizer is None:
+        _tokenizer = get_tokenizer()
+    return len(_tokenizer(text))
+
+def _shingles(text: str, size: int = 3) -> set:
+    words = re.findall(r"\w+", text.lower())
+    if len(words) < size:
+        return {tuple(words)}
+    return {tuple(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+def _similarity(a: set, b: set) -> float:
+    """Overlap coefficient, so a chunk contained in a longer one counts as a duplicate."""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / min(len(a), len(b))
+
+def _merge_text(first: str, second: str) -> str:
+    """Join two consecutive chunks, dropping the text they overlap on."""
+    for size in range(min(len(first), len(second), MAX_OVERLAP_CHARS), 0, -1):
+        if first.endswith(second[:size]):
+            return first + second[size:]
+    return first + "\n" + second
+
+def drop_duplicates(results: List[Dict[str, Any]], threshold: float) -> List[Dict[str, Any]]:
+    """Drop results whose text nearly repeats a better-scored result."""
+    kept = []
+    kept_shingles = []
+    for result in sorted(results, key=lambda r: r["similarity_score"], reverse=True):
+        shingles = _shingles(result["content"])
+        if any(_similarity(shingles, other) >= threshold for other in kept_shingles):
+            continue
+        kept.append(result)
+        kept_shingles.append(shingles)
+    return kept
+
+def merge_adjacent(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Merge results with consecutive ``chunk_id``s from the same file into one passage.
+
+    A passage keeps the best similarity score of its chunks.
+    """
+    by_file = {}
+    passages = []
+    for result in results:
+        if result.get("chunk_id") is None:
+            passages.append(dict(result))
+        else:
+            key = result.get("filepath") or result.get("filename")
+            by_file.setdefault(key, []).append(result)
+
+    for chunks in by_file.values():
+        chunks.sort(key=lambda r: r["chunk_id"])
+        passage = None
+        for chunk in chunks:
+            if passage is not None and chunk["chunk_id"] == passage["last_chunk_id"] + 1:
+                passage["content"] = _merge_text(passage["content"], chunk["content"])
+                passage["similarity_score"] = max(passage["similarity_score"], chunk["similarity_score"])
+                passage["last_chunk_id"] = chunk["chunk_id"]
+                continue
+            passage = dict(chunk, last_chunk_id=chunk["chunk_id"])
+            passages.append(passage)
+    return passages
+
+def pack(passages: List[Dict[str, Any]], budget: int) -> List[Dict[str, Any]]:
+    """
+    Pick passages by descending score while they fit in ``budget`` tokens.
+
+    Passages that don't fit are skipped so smaller, lower-scored ones can still
+    use the remaining budget. If not even the best passage fits, it is truncated.
+    """
+    ranked = sorted(passages, key=lambda p: p["similarity_score"], reverse=True)
+    selected = []
+    used = 0
+    for passage in ranked:
+        tokens = count_tokens(passage["content"])
+        if used + tokens <= budget:
+            selected.append(passage)
+            used += tokens
+
+    if not selected and ranked:
+        text = ranked[0]["content"]
+        # Keep the share of characters proportional to the share of tokens that fit.
+        ratio = budget / max(count_tokens(text), 1)
+        selected.append(dict(ranked[0], content=text[:int(len(text) * ratio)]))
+    return selected
+
+def build_context(results: List[Dict[str, Any]], budget: Optional[int] = None,
+                  threshold: Optional[float] = None) -> List[Dict[str, Any]]:
+    """
+    Turn search results into the passages sent to the LLM, best first.
+
+    Args:
+        results: Search results above the similarity threshold
+        budget: Max context tokens, defaults to CONTEXT_TOKEN_BUDGET
+        threshold: Near-duplicate threshold, defaults to CONTEXT_DEDUP_THRESHOLD
+
+    Returns:
+        The selected passages, each with ``content``, ``filename`` and ``similarity_score``
+    """
+    if budget is None:
+        budget = config.CONTEXT_TOKEN_BUDGET
+    if threshold is None:
+        threshold = config.CONTEXT_DEDUP_THRESHOLD
+
+    results = [r for r in results if r.get("content")]
+    if not results:
+        return []
+
+    tokens_before = count_tokens("\n\n".join(r["content"] for r in results))
+    unique = drop_duplicates(results, threshold)
+    passages = merge_adjacent(unique)
+    selected = pack(passages, budget)
+    tokens_after = count_tokens("\n\n".join(p["content"] for p in selected))
+
+    logger.info(
+        f"Context packing: {len(results)} chunks ({tokens_before} tokens) -> "
+        f"{len(results) - len(unique)} duplicates dropped, {len(passages)} passages, "
+        f"{len(selected)} selected ({tokens_after} tokens, budget {budget})"
+    )
+    return selected
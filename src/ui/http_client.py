@@ -0,0 +1,189 @@
+import logging
+import random
+import threading
+import time
+from typing import Dict, Optional, Tuple, Union
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+import config
+
+logger = logging.getLogger(__name__)
+
+Timeout = Union[float, Tuple[float, Optional[float]]]
+
+# Gateway and availability errors: the service is down or overloaded, so they
+# are retried and count against its circuit breaker. Other 5xx are application
+# errors of a healthy service.
+RETRY_STATUS_CODES = {502, 503, 504}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+def is_connect_error(error: requests.exceptions.RequestException) -> bool:
+    """Whether the request failed before reaching the service, so it is safe to resend."""
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    return (isinstance(error, requests.exceptions.ConnectionError)
+            and not isinstance(error, requests.exceptions.ReadTimeout))
+
+def is_transport_error(error: requests.exceptions.RequestException) -> bool:
+    """Whether the service could not be reached or did not answer in time."""
+    return isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout))
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Raised instead of calling a host whose circuit breaker is open."""
+
+class CircuitBreaker:
+    """
+    Stop calling a host after ``failure_threshold`` consecutive failures.
+
+    Once ``reset_timeout`` seconds have passed, a single trial request is let
+    through (half-open): success closes the circuit again, failure reopens it.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_progress = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half-open" and not self.trial_in_progress:
+                self.trial_in_progress = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_in_progress = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self.trial_in_progress = False
+            if self.opened_at is not None or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+class HTTPClient:
+    """
+    Shared keep-alive HTTP client for the services the UI calls.
+
+    Connections are pooled per host by one ``requests.Session``. Each request
+    gets the timeout configured for its path, idempotent requests are retried
+    on connection errors, connect timeouts and 502/503/504 with jittered
+    exponential backoff, and every host has its own circuit breaker, tripped by
+    transport errors and 502/503/504, so an unresponsive service fails fast
+    instead of holding Gradio workers. Read timeouts are not retried: the
+    service already got the request and is likely still working on it.
+    """
+
+    def __init__(self, timeouts: Optional[Dict[str, Timeout]] = None, default_timeout: Timeout = 10,
+                 retries: int = 2, backoff: float = 0.2, failure_threshold: int = 5,
+                 reset_timeout: float = 30, pool_size: int = 10):
+        self.timeouts = timeouts or {}
+        self.default_timeout = default_timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def breaker(self, url: str) -> CircuitBreaker:
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host not in self._breakers:
+                self._breakers[host] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+            return self._breakers[host]
+
+    def timeout_for(self, url: str) -> Timeout:
+        return self.timeouts.get(urlsplit(url).path, self.default_timeout)
+
+    def request(self, method: str, url: str, retry: Optional[bool] = None, **kwargs) -> requests.Response:
+        """
+        Send a request, retrying it and tracking the host's circuit breaker.
+
+        Args:
+            method: HTTP method
+            url: Absolute URL
+            retry: Whether to retry; defaults to retrying idempotent methods only
+            **kwargs: Passed to ``requests.Session.request``
+
+        Returns:
+            The response; 502/503/504 responses are returned once retries are exhausted
+
+        Raises:
+            CircuitOpenError: The host's circuit breaker is open
+            requests.RequestException: The request failed and was not retried further
+        """
+        method = method.upper()
+        if retry is None:
+            retry = method in IDEMPOTENT_METHODS
+        attempts = 1 + (self.retries if retry else 0)
+        kwargs.setdefault("timeout", self.timeout_for(url))
+        breaker = self.breaker(url)
+
+        for attempt in range(attempts):
+            if not breaker.allow():
+                raise CircuitOpenError(f"Circuit breaker open for {urlsplit(url).netloc}")
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except requests.exceptions.RequestException as e:
+                if is_transport_error(e):
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+                if not is_connect_error(e) or attempt + 1 >= attempts:
+                    raise
+                logger.warning(f"{method} {url} failed ({str(e)}), retrying")
+            else:
+                if response.status_code not in RETRY_STATUS_CODES:
+                    breaker.record_success()
+                    return response
+                breaker.record_failure()
+                if attempt + 1 >= attempts:
+                    return response
+                logger.warning(f"{method} {url} returned {response.status_code}, retrying")
+                response.close()
+            # Full jitter keeps concurrent retries from hitting the service in lockstep.
+            time.sleep(random.uniform(0, self.backoff * 2 ** attempt))
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+http_client = HTTPClient(
+    timeouts={
+        "/search": (config.HTTP_CONNECT_TIMEOUT, config.RETRIEVER_SEARCH_TIMEOUT),
+        "/files": (config.HTTP_CONNECT_TIMEOUT, config.RETRIEVER_FILES_TIMEOUT),
+        "/api/tags": (config.HTTP_CONNECT_TIMEOUT, config.OLLAMA_TAGS_TIMEOUT),
+        # Read timeout between progress lines of a streamed model pull.
+        "/api/pull": (config.HTTP_CONNECT_TIMEOUT, 300),
+    },
+    default_timeout=(config.HTTP_CONNECT_TIMEOUT, 30),
+    retries=config.HTTP_RETRIES,
+    backoff=config.HTTP_RETRY_BACKOFF,
+    failure_threshold=config.CIRCUIT_BREAKER_FAILURES,
+    reset_timeout=config.CIRCUIT_BREAKER_RESET_TIMEOUT,
+)
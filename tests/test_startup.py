@@ -0,0 +1,36 @@
+import importlib.util
+import os
+
+import pytest
+
+
+SRC = os.path.join(os.path.dirname(__file__), "..", "src")
+
+
+def load_startup(service):
+    spec = importlib.util.spec_from_file_location(
+        f"{service}_startup", os.path.join(SRC, service, "startup.py")
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.mark.parametrize("service", ["embedder", "retriever"])
+def test_startup_defaults_to_import_time(service):
+    module = load_startup(service)
+    startup = module.Startup()
+    assert startup.started_at == module.IMPORTED_AT
+    assert startup.phases["imports"] >= 0
+    assert startup.status()["status"] == "starting"
+
+
+@pytest.mark.parametrize("service", ["embedder", "retriever"])
+def test_startup_phases_are_recorded(service):
+    startup = load_startup(service).Startup(started_at=0.0)
+    with startup.phase("load_model"):
+        assert startup.status()["phase"] == "load_model"
+    startup._mark_ready()
+    status = startup.status()
+    assert status["status"] == "ready"
+    assert set(status["phases"]) == {"imports", "load_model"}